@@ -0,0 +1,198 @@
+// Copyright (c) 2024 skypro1111@gmail.com
+// All rights reserved.
+
+package wav2ulaw
+
+import (
+	"fmt"
+	"math"
+	"strconv"
+	"strings"
+)
+
+// biquadCoeffs holds one normalized second-order section (a0 == 1).
+// First-order sections are encoded with b2 == a2 == 0.
+type biquadCoeffs struct {
+	b0, b1, b2, a1, a2 float64
+}
+
+// clampFilterOrder keeps the order in the supported 2-6 range
+func clampFilterOrder(order int) int {
+	if order < 2 {
+		return 2
+	}
+	if order > 6 {
+		return 6
+	}
+	return order
+}
+
+// clampCutoff keeps section cutoffs below Nyquist so the bilinear
+// transform stays well-behaved (Bessel/Chebyshev sections sit above
+// the nominal cutoff)
+func clampCutoff(cutoffFreq, sampleRate float64) float64 {
+	nyquist := sampleRate / 2.0
+	if cutoffFreq > nyquist*0.99 {
+		return nyquist * 0.99
+	}
+	return cutoffFreq
+}
+
+// rbjLowPass designs one digital low-pass biquad (RBJ cookbook) for the
+// given cutoff and quality factor; DC gain is exactly 1
+func rbjLowPass(cutoffFreq, sampleRate, q float64) biquadCoeffs {
+	cutoffFreq = clampCutoff(cutoffFreq, sampleRate)
+	w0 := 2.0 * math.Pi * cutoffFreq / sampleRate
+	cosw := math.Cos(w0)
+	alpha := math.Sin(w0) / (2.0 * q)
+
+	a0 := 1.0 + alpha
+	return biquadCoeffs{
+		b0: (1.0 - cosw) / 2.0 / a0,
+		b1: (1.0 - cosw) / a0,
+		b2: (1.0 - cosw) / 2.0 / a0,
+		a1: -2.0 * cosw / a0,
+		a2: (1.0 - alpha) / a0,
+	}
+}
+
+// firstOrderLowPass designs a single-pole low-pass section via the
+// bilinear transform
+func firstOrderLowPass(cutoffFreq, sampleRate float64) biquadCoeffs {
+	cutoffFreq = clampCutoff(cutoffFreq, sampleRate)
+	k := math.Tan(math.Pi * cutoffFreq / sampleRate)
+	a0 := k + 1.0
+	return biquadCoeffs{
+		b0: k / a0,
+		b1: k / a0,
+		a1: (k - 1.0) / a0,
+	}
+}
+
+// designButterworthSOS decomposes an order-N Butterworth low-pass into
+// second-order sections; odd orders get a first-order tail
+func designButterworthSOS(order int, cutoffFreq, sampleRate float64) []biquadCoeffs {
+	order = clampFilterOrder(order)
+	sections := make([]biquadCoeffs, 0, (order+1)/2)
+
+	if order%2 == 1 {
+		sections = append(sections, firstOrderLowPass(cutoffFreq, sampleRate))
+	}
+	for k := 0; k < order/2; k++ {
+		// Pole pair angle from the imaginary axis; Q = 1/(2 sin theta)
+		theta := math.Pi * float64(2*k+1) / float64(2*order)
+		sections = append(sections, rbjLowPass(cutoffFreq, sampleRate, 1.0/(2.0*math.Sin(theta))))
+	}
+
+	return sections
+}
+
+// designChebyshevSOS decomposes an order-N Chebyshev Type I low-pass into
+// second-order sections from the analog prototype poles
+func designChebyshevSOS(order int, cutoffFreq, sampleRate, rippleDb float64) []biquadCoeffs {
+	order = clampFilterOrder(order)
+	epsilon := math.Sqrt(math.Pow(10, rippleDb/10.0) - 1.0)
+	v0 := math.Asinh(1.0/epsilon) / float64(order)
+	sinhV := math.Sinh(v0)
+	coshV := math.Cosh(v0)
+
+	sections := make([]biquadCoeffs, 0, (order+1)/2)
+
+	if order%2 == 1 {
+		// Real pole at -sinh(v0)
+		sections = append(sections, firstOrderLowPass(cutoffFreq*sinhV, sampleRate))
+	}
+	for k := 0; k < order/2; k++ {
+		theta := math.Pi * float64(2*k+1) / float64(2*order)
+		sigma := -sinhV * math.Sin(theta)
+		omega := coshV * math.Cos(theta)
+		w0 := math.Hypot(sigma, omega)
+		sections = append(sections, rbjLowPass(cutoffFreq*w0, sampleRate, w0/(-2.0*sigma)))
+	}
+
+	return sections
+}
+
+// besselSections holds (frequency factor, Q) pairs for -3 dB normalized
+// Bessel filters; Q == 0 marks a first-order section
+var besselSections = map[int][][2]float64{
+	2: {{1.2736, 0.5773}},
+	3: {{1.3270, 0}, {1.4524, 0.6910}},
+	4: {{1.4192, 0.5219}, {1.5912, 0.8055}},
+	5: {{1.5023, 0}, {1.5611, 0.5635}, {1.7607, 0.9165}},
+	6: {{1.6060, 0.5103}, {1.6913, 0.6112}, {1.9071, 1.0234}},
+}
+
+// designBesselSOS builds an order-N Bessel low-pass from the tabulated
+// pole positions
+func designBesselSOS(order int, cutoffFreq, sampleRate float64) []biquadCoeffs {
+	order = clampFilterOrder(order)
+	sections := make([]biquadCoeffs, 0, (order+1)/2)
+
+	for _, s := range besselSections[order] {
+		f := cutoffFreq * s[0]
+		if s[1] == 0 {
+			sections = append(sections, firstOrderLowPass(f, sampleRate))
+		} else {
+			sections = append(sections, rbjLowPass(f, sampleRate, s[1]))
+		}
+	}
+
+	return sections
+}
+
+// parseSOS parses pre-designed sections "b0,b1,b2,a1,a2;..." (a0 == 1)
+func parseSOS(spec string) ([]biquadCoeffs, error) {
+	var sections []biquadCoeffs
+	for _, part := range strings.Split(spec, ";") {
+		fields := strings.Split(part, ",")
+		if len(fields) != 5 {
+			return nil, fmt.Errorf("SOS section needs 5 coefficients, got %d", len(fields))
+		}
+		var vals [5]float64
+		for i, field := range fields {
+			v, err := strconv.ParseFloat(strings.TrimSpace(field), 64)
+			if err != nil {
+				return nil, fmt.Errorf("invalid SOS coefficient %q: %v", field, err)
+			}
+			vals[i] = v
+		}
+		sections = append(sections, biquadCoeffs{vals[0], vals[1], vals[2], vals[3], vals[4]})
+	}
+	return sections, nil
+}
+
+// applyBiquad runs one section over the samples in float64
+func applyBiquad(samples []int16, c biquadCoeffs) []int16 {
+	result := make([]int16, len(samples))
+	x1, x2 := 0.0, 0.0
+	y1, y2 := 0.0, 0.0
+
+	for i, sample := range samples {
+		x := float64(sample)
+
+		// Direct form I
+		y := c.b0*x + c.b1*x1 + c.b2*x2 - c.a1*y1 - c.a2*y2
+
+		// Update delays
+		x2, x1 = x1, x
+		y2, y1 = y1, y
+
+		result[i] = int16(math.Max(-32768, math.Min(32767, math.Round(y))))
+	}
+
+	return result
+}
+
+// applyCascade runs the samples through each section in turn, in float64
+// or in Q14 fixed point
+func applyCascade(samples []int16, sections []biquadCoeffs, fixedPoint bool) []int16 {
+	for _, c := range sections {
+		if fixedPoint {
+			samples = applyBiquadQ14(samples, c.b0, c.b1, c.b2, c.a1, c.a2)
+		} else {
+			samples = applyBiquad(samples, c)
+		}
+	}
+	return samples
+}
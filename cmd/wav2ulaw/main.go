@@ -4,31 +4,240 @@
 package main
 
 import (
+	"bufio"
+	"encoding/binary"
+	"encoding/json"
 	"flag"
 	"fmt"
+	"io"
+	"time"
 	"wav2ulaw"
 	"os"
 )
 
+// batchParams mirrors the CLI flags for a single conversion
+type batchParams struct {
+	SampleRate        int     `json:"sample_rate"`
+	ForceMono         bool    `json:"force_mono"`
+	LowPass           float64 `json:"low_pass"`
+	HighPass          float64 `json:"high_pass"`
+	Normalize         float64 `json:"normalize"`
+	CompressRatio     float64 `json:"compress_ratio"`
+	CompressThreshold float64 `json:"compress_threshold"`
+	WindowSize        int     `json:"window_size"`
+	PolyPhases        int     `json:"poly_phases"`
+	TapsPerPhase      int     `json:"taps_per_phase"`
+	AntiAliasingRatio float64 `json:"anti_aliasing_ratio"`
+	AntiAliasingType  int     `json:"anti_aliasing_type"`
+	FilterOrder       int     `json:"filter_order"`
+	ChebyshevRipple   float64 `json:"chebyshev_ripple"`
+	Precision         string  `json:"precision"`
+	SOS               string  `json:"sos"`
+}
+
+// batchEntry is one conversion request in a --batch run
+type batchEntry struct {
+	Name   string      `json:"name"`
+	Params batchParams `json:"params"`
+}
+
+// toConfig converts JSON parameters to an AudioConfig
+func (p *batchParams) toConfig() *wav2ulaw.AudioConfig {
+	return &wav2ulaw.AudioConfig{
+		InputSampleRate:         p.SampleRate,
+		ForceMono:               p.ForceMono,
+		LowPassCutoff:           p.LowPass,
+		HighPassCutoff:          p.HighPass,
+		NormalizePeak:           p.Normalize,
+		CompressionRatio:        p.CompressRatio,
+		CompressionThreshold:    p.CompressThreshold,
+		ResamplingWindowSize:    p.WindowSize,
+		PolyPhases:              p.PolyPhases,
+		TapsPerPhase:            p.TapsPerPhase,
+		AntiAliasingCutoffRatio: p.AntiAliasingRatio,
+		AntiAliasingType:        wav2ulaw.AntiAliasingType(p.AntiAliasingType),
+		FilterOrder:             p.FilterOrder,
+		ChebyshevRipple:         p.ChebyshevRipple,
+		Precision:               p.Precision,
+		SOS:                     p.SOS,
+	}
+}
+
+// readFrame reads a 4-byte little-endian length prefix followed by that many bytes
+func readFrame(r io.Reader) ([]byte, error) {
+	var hdr [4]byte
+	if _, err := io.ReadFull(r, hdr[:]); err != nil {
+		return nil, err
+	}
+	data := make([]byte, binary.LittleEndian.Uint32(hdr[:]))
+	if _, err := io.ReadFull(r, data); err != nil {
+		return nil, err
+	}
+	return data, nil
+}
+
+// runBatch processes several conversions of one WAV in a single invocation.
+// Input: length-prefixed JSON array of batchEntry, then the length-prefixed WAV.
+// Output per entry: 8-byte elapsed nanoseconds, 4-byte u-law length, u-law bytes.
+func runBatch(r io.Reader, w io.Writer) error {
+	configJSON, err := readFrame(r)
+	if err != nil {
+		return fmt.Errorf("error reading batch config: %v", err)
+	}
+
+	var entries []batchEntry
+	if err := json.Unmarshal(configJSON, &entries); err != nil {
+		return fmt.Errorf("error parsing batch config: %v", err)
+	}
+
+	wavData, err := readFrame(r)
+	if err != nil {
+		return fmt.Errorf("error reading WAV data: %v", err)
+	}
+
+	out := bufio.NewWriter(w)
+	var frame [12]byte
+	for _, entry := range entries {
+		start := time.Now()
+		ulawData, err := wav2ulaw.ConvertWavBytesToUlaw(wavData, entry.Params.toConfig())
+		if err != nil {
+			return fmt.Errorf("error converting '%s': %v", entry.Name, err)
+		}
+		elapsed := time.Since(start)
+
+		binary.LittleEndian.PutUint64(frame[:8], uint64(elapsed.Nanoseconds()))
+		binary.LittleEndian.PutUint32(frame[8:], uint32(len(ulawData)))
+		if _, err := out.Write(frame[:]); err != nil {
+			return err
+		}
+		if _, err := out.Write(ulawData); err != nil {
+			return err
+		}
+	}
+
+	return out.Flush()
+}
+
+// runServer keeps one process alive and serves conversions until stdin closes.
+// Request: length-prefixed JSON batchParams, then the length-prefixed WAV.
+// Response: 4-byte u-law length, u-law bytes. Caches (sinc/kernel tables)
+// stay warm across requests.
+func runServer(r io.Reader, w io.Writer) error {
+	in := bufio.NewReader(r)
+	out := bufio.NewWriter(w)
+	var hdr [4]byte
+	for {
+		paramsJSON, err := readFrame(in)
+		if err == io.EOF {
+			return nil
+		}
+		if err != nil {
+			return fmt.Errorf("error reading request params: %v", err)
+		}
+
+		var params batchParams
+		if err := json.Unmarshal(paramsJSON, &params); err != nil {
+			return fmt.Errorf("error parsing request params: %v", err)
+		}
+
+		wavData, err := readFrame(in)
+		if err != nil {
+			return fmt.Errorf("error reading WAV data: %v", err)
+		}
+
+		ulawData, err := wav2ulaw.ConvertWavBytesToUlaw(wavData, params.toConfig())
+		if err != nil {
+			return fmt.Errorf("error converting WAV to u-law: %v", err)
+		}
+
+		binary.LittleEndian.PutUint32(hdr[:], uint32(len(ulawData)))
+		if _, err := out.Write(hdr[:]); err != nil {
+			return err
+		}
+		if _, err := out.Write(ulawData); err != nil {
+			return err
+		}
+		if err := out.Flush(); err != nil {
+			return err
+		}
+	}
+}
+
 func main() {
 	// Define command line flags
-	inputFile := flag.String("input", "", "Input file path")
-	outputFile := flag.String("output", "", "Output file path")
+	inputFile := flag.String("input", "", "Input file path (use '-' for stdin)")
+	outputFile := flag.String("output", "", "Output file path (use '-' for stdout)")
 	mode := flag.String("mode", "wav2ulaw", "Conversion mode: wav2ulaw or ulaw2wav")
 	sampleRate := flag.Uint("sample-rate", 8000, "Sample rate for output WAV file (only for ulaw2wav mode)")
+	inputSampleRate := flag.Int("input-sample-rate", 0, "Input sample rate override in Hz (0 = detect from WAV header)")
 	lowPass := flag.Float64("low-pass", 3400, "Low-pass filter cutoff frequency in Hz")
 	highPass := flag.Float64("high-pass", 300, "High-pass filter cutoff frequency in Hz")
 	normalize := flag.Float64("normalize", 0.9, "Normalize audio to this peak level (0.0 to 1.0)")
 	compressRatio := flag.Float64("compress-ratio", 2.0, "Compression ratio (1.0 means no compression)")
 	compressThreshold := flag.Float64("compress-threshold", 0.5, "Compression threshold (0.0 to 1.0)")
 	windowSize := flag.Int("window-size", 16, "Resampling window size (larger = better quality but slower)")
+	polyPhases := flag.Int("poly-phases", 32, "Polyphase resampler phase count (0 = windowed sinc)")
+	tapsPerPhase := flag.Int("taps-per-phase", 0, "Filter taps per polyphase phase (0 = window size)")
 	antiAliasingRatio := flag.Float64("anti-aliasing-ratio", 0.9, "Anti-aliasing filter cutoff ratio (0.0 to 1.0)")
 	antiAliasingType := flag.Int("anti-aliasing-type", int(wav2ulaw.AAButterworth), "Anti-aliasing filter type (0=Simple, 1=Butterworth, 2=Bessel, 3=Chebyshev)")
 	filterOrder := flag.Int("filter-order", 4, "Filter order for Butterworth/Bessel/Chebyshev (2-6)")
 	chebyshevRipple := flag.Float64("chebyshev-ripple", 0.5, "Ripple in dB for Chebyshev filter (0.1-3.0)")
+	precision := flag.String("precision", "float64", "Biquad filter precision: float64 or int16 (Q14 fixed point)")
+	sos := flag.String("sos", "", "Pre-designed anti-aliasing sections 'b0,b1,b2,a1,a2;...' (skips filter design)")
+	batchMode := flag.Bool("batch", false, "Read a batch of conversion requests from stdin and write results to stdout")
+	serverMode := flag.Bool("server", false, "Stay resident and serve conversion requests over stdin/stdout")
+	shmIn := flag.String("shm-in", "", "Shared memory segment name holding the input WAV (under /dev/shm)")
+	shmOut := flag.String("shm-out", "", "Shared memory segment name for the u-law output")
+	shmLen := flag.Int("shm-len", 0, "Input length in bytes for --shm-in")
 
 	flag.Parse()
 
+	// Batch mode drives everything over stdin/stdout
+	if *batchMode {
+		if err := runBatch(os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintf(os.Stderr, "Batch error: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+
+	// Server mode amortizes process startup across many conversions
+	if *serverMode {
+		if err := runServer(os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintf(os.Stderr, "Server error: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+
+	// Conversion parameters shared by the file/pipe and shared-memory paths
+	cliConfig := &wav2ulaw.AudioConfig{
+		InputSampleRate:        *inputSampleRate,
+		LowPassCutoff:          *lowPass,
+		HighPassCutoff:         *highPass,
+		NormalizePeak:          *normalize,
+		CompressionRatio:       *compressRatio,
+		CompressionThreshold:   *compressThreshold,
+		ResamplingWindowSize:   *windowSize,
+		PolyPhases:             *polyPhases,
+		TapsPerPhase:           *tapsPerPhase,
+		AntiAliasingCutoffRatio: *antiAliasingRatio,
+		AntiAliasingType:       wav2ulaw.AntiAliasingType(*antiAliasingType),
+		FilterOrder:            *filterOrder,
+		ChebyshevRipple:        *chebyshevRipple,
+		Precision:              *precision,
+		SOS:                    *sos,
+	}
+
+	// Shared-memory mode: the payload never crosses a pipe or the filesystem
+	if *shmIn != "" && *shmOut != "" {
+		if err := runShm(*shmIn, *shmOut, *shmLen, cliConfig); err != nil {
+			fmt.Fprintf(os.Stderr, "Shared memory error: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+
 	// Validate input parameters
 	if *inputFile == "" || *outputFile == "" {
 		fmt.Println("Error: Input and output file paths are required")
@@ -36,8 +245,14 @@ func main() {
 		os.Exit(1)
 	}
 
-	// Read input file
-	inputData, err := os.ReadFile(*inputFile)
+	// Read input file (or stdin)
+	var inputData []byte
+	var err error
+	if *inputFile == "-" {
+		inputData, err = io.ReadAll(os.Stdin)
+	} else {
+		inputData, err = os.ReadFile(*inputFile)
+	}
 	if err != nil {
 		fmt.Printf("Error reading input file: %v\n", err)
 		os.Exit(1)
@@ -47,20 +262,7 @@ func main() {
 
 	// Process based on mode
 	if *mode == "wav2ulaw" {
-		config := &wav2ulaw.AudioConfig{
-			LowPassCutoff:          *lowPass,
-			HighPassCutoff:         *highPass,
-			NormalizePeak:          *normalize,
-			CompressionRatio:       *compressRatio,
-			CompressionThreshold:   *compressThreshold,
-			ResamplingWindowSize:   *windowSize,
-			AntiAliasingCutoffRatio: *antiAliasingRatio,
-			AntiAliasingType:       wav2ulaw.AntiAliasingType(*antiAliasingType),
-			FilterOrder:            *filterOrder,
-			ChebyshevRipple:       *chebyshevRipple,
-		}
-
-		outputData, err = wav2ulaw.ConvertWavBytesToUlaw(inputData, config)
+		outputData, err = wav2ulaw.ConvertWavBytesToUlaw(inputData, cliConfig)
 		if err != nil {
 			fmt.Printf("Error converting WAV to u-law: %v\n", err)
 			os.Exit(1)
@@ -76,12 +278,19 @@ func main() {
 		os.Exit(1)
 	}
 
-	// Write output file
-	err = os.WriteFile(*outputFile, outputData, 0644)
-	if err != nil {
-		fmt.Printf("Error writing output file: %v\n", err)
-		os.Exit(1)
-	}
+	// Write output file (or stdout; keep stdout clean when it carries the payload)
+	if *outputFile == "-" {
+		if _, err = os.Stdout.Write(outputData); err != nil {
+			fmt.Fprintf(os.Stderr, "Error writing output: %v\n", err)
+			os.Exit(1)
+		}
+	} else {
+		err = os.WriteFile(*outputFile, outputData, 0644)
+		if err != nil {
+			fmt.Printf("Error writing output file: %v\n", err)
+			os.Exit(1)
+		}
 
-	fmt.Println("Conversion completed successfully")
+		fmt.Println("Conversion completed successfully")
+	}
 } 
\ No newline at end of file
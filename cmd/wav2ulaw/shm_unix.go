@@ -0,0 +1,62 @@
+//go:build !windows
+
+// Copyright (c) 2024 skypro1111@gmail.com
+// All rights reserved.
+
+package main
+
+import (
+	"fmt"
+	"os"
+	"syscall"
+	"wav2ulaw"
+)
+
+// runShm converts a WAV held in a POSIX shared memory segment and writes the
+// u-law into a second segment, so the payload never crosses a pipe or the
+// filesystem. The caller creates both segments; the u-law byte count is
+// printed to stdout since only the producer knows it.
+func runShm(nameIn, nameOut string, inLen int, config *wav2ulaw.AudioConfig) error {
+	fIn, err := os.Open("/dev/shm/" + nameIn)
+	if err != nil {
+		return fmt.Errorf("error opening input segment: %v", err)
+	}
+	defer fIn.Close()
+
+	inData, err := syscall.Mmap(int(fIn.Fd()), 0, inLen, syscall.PROT_READ, syscall.MAP_SHARED)
+	if err != nil {
+		return fmt.Errorf("error mapping input segment: %v", err)
+	}
+	defer syscall.Munmap(inData)
+
+	ulawData, err := wav2ulaw.ConvertWavBytesToUlaw(inData, config)
+	if err != nil {
+		return fmt.Errorf("error converting WAV to u-law: %v", err)
+	}
+
+	fOut, err := os.OpenFile("/dev/shm/"+nameOut, os.O_RDWR, 0)
+	if err != nil {
+		return fmt.Errorf("error opening output segment: %v", err)
+	}
+	defer fOut.Close()
+
+	stat, err := fOut.Stat()
+	if err != nil {
+		return fmt.Errorf("error sizing output segment: %v", err)
+	}
+
+	outData, err := syscall.Mmap(int(fOut.Fd()), 0, int(stat.Size()),
+		syscall.PROT_READ|syscall.PROT_WRITE, syscall.MAP_SHARED)
+	if err != nil {
+		return fmt.Errorf("error mapping output segment: %v", err)
+	}
+	defer syscall.Munmap(outData)
+
+	if len(ulawData) > len(outData) {
+		return fmt.Errorf("output segment too small: need %d bytes, have %d", len(ulawData), len(outData))
+	}
+	copy(outData, ulawData)
+
+	fmt.Println(len(ulawData))
+	return nil
+}
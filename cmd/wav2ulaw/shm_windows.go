@@ -0,0 +1,15 @@
+//go:build windows
+
+// Copyright (c) 2024 skypro1111@gmail.com
+// All rights reserved.
+
+package main
+
+import (
+	"fmt"
+	"wav2ulaw"
+)
+
+func runShm(nameIn, nameOut string, inLen int, config *wav2ulaw.AudioConfig) error {
+	return fmt.Errorf("shared memory mode is not supported on Windows")
+}
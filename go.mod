@@ -5,7 +5,6 @@ go 1.21
 require (
 	github.com/go-audio/audio v1.0.0
 	github.com/go-audio/wav v1.1.0
-	github.com/zaf/g711 v1.4.0
 )
 
 require github.com/go-audio/riff v1.0.0 // indirect
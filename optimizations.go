@@ -81,23 +81,202 @@ func (t *SincTable) getSincValue(x float64) float64 {
 	return t.values[i]*(1-frac) + t.values[i+1]*frac
 }
 
-// Оновлена версія resamplePCM16 з використанням попередньо обчисленої таблиці
-func resamplePCM16WithTable(input []int16, inputRate, outputRate float64, windowSize int) []int16 {
+// kernelKey ідентифікує ядро ресемплінгу для пари частот та розміру вікна
+type kernelKey struct {
+	inputRate  float64
+	outputRate float64
+	windowSize int
+}
+
+// resampleKernel зберігає попередньо обчислені коефіцієнти ресемплінгу
+type resampleKernel struct {
+	window []float64
+	sinc   *SincTable
+}
+
+var (
+	// Кеш ядер для різних комбінацій частот та розмірів вікна
+	kernelCache      = make(map[kernelKey]*resampleKernel)
+	kernelCacheMutex sync.RWMutex
+)
+
+// getResampleKernel повертає або створює ядро ресемплінгу для заданих параметрів
+func getResampleKernel(inputRate, outputRate float64, windowSize int) *resampleKernel {
+	key := kernelKey{inputRate, outputRate, windowSize}
+
+	kernelCacheMutex.RLock()
+	kernel, exists := kernelCache[key]
+	kernelCacheMutex.RUnlock()
+
+	if exists {
+		return kernel
+	}
+
+	// Якщо ядро не існує, створюємо нове
+	kernelCacheMutex.Lock()
+	defer kernelCacheMutex.Unlock()
+
+	// Перевіряємо ще раз після отримання блокування
+	if kernel, exists = kernelCache[key]; exists {
+		return kernel
+	}
+
+	kernel = &resampleKernel{
+		window: make([]float64, windowSize*2+1),
+		sinc:   getSincTable(windowSize),
+	}
+
+	// Blackman window
+	for i := range kernel.window {
+		x := float64(i) / float64(len(kernel.window)-1)
+		kernel.window[i] = 0.42 - 0.5*math.Cos(2*math.Pi*x) + 0.08*math.Cos(4*math.Pi*x)
+	}
+
+	kernelCache[key] = kernel
+	return kernel
+}
+
+// polyKey ідентифікує банк поліфазних фільтрів
+type polyKey struct {
+	inputRate  float64
+	outputRate float64
+	phases     int
+	taps       int
+}
+
+// polyBank зберігає попередньо обчислені коефіцієнти для кожної фази.
+// Фаза p відповідає фракційному зсуву p/phases між вхідними семплами.
+type polyBank struct {
+	phases int
+	taps   int
+	coeffs [][]float64
+}
+
+var (
+	// Кеш поліфазних банків для різних комбінацій параметрів
+	polyBankCache      = make(map[polyKey]*polyBank)
+	polyBankCacheMutex sync.RWMutex
+)
+
+// getPolyBank повертає або створює банк поліфазних фільтрів
+func getPolyBank(inputRate, outputRate float64, phases, taps int) *polyBank {
+	key := polyKey{inputRate, outputRate, phases, taps}
+
+	polyBankCacheMutex.RLock()
+	bank, exists := polyBankCache[key]
+	polyBankCacheMutex.RUnlock()
+
+	if exists {
+		return bank
+	}
+
+	polyBankCacheMutex.Lock()
+	defer polyBankCacheMutex.Unlock()
+
+	// Перевіряємо ще раз після отримання блокування
+	if bank, exists = polyBankCache[key]; exists {
+		return bank
+	}
+
+	bank = &polyBank{
+		phases: phases,
+		taps:   taps,
+		coeffs: make([][]float64, phases),
+	}
+
+	half := taps / 2
+	for p := 0; p < phases; p++ {
+		frac := float64(p) / float64(phases)
+		coeffs := make([]float64, taps)
+		sum := 0.0
+
+		for j := 0; j < taps; j++ {
+			// Відстань від точки виходу до j-го вхідного семпла
+			d := float64(j-half) - frac
+
+			var sincVal float64
+			if d == 0 {
+				sincVal = 1.0
+			} else {
+				x := math.Pi * d
+				sincVal = math.Sin(x) / x
+			}
+
+			// Blackman window, зсунуте на фракційний зсув фази
+			t := (float64(j) + 1.0 - frac) / float64(taps+1)
+			window := 0.42 - 0.5*math.Cos(2*math.Pi*t) + 0.08*math.Cos(4*math.Pi*t)
+
+			coeffs[j] = window * sincVal
+			sum += coeffs[j]
+		}
+
+		// Нормалізуємо фазу до одиничного підсилення на постійній складовій
+		if sum != 0 {
+			for j := range coeffs {
+				coeffs[j] /= sum
+			}
+		}
+
+		bank.coeffs[p] = coeffs
+	}
+
+	polyBankCache[key] = bank
+	return bank
+}
+
+// resamplePCM16Poly виконує поліфазний ресемплінг: замість обчислення sinc
+// для кожного вихідного семпла вибирається найближча попередньо обчислена
+// фаза, і залишається лише taps множень-додавань по суцільній пам'яті
+func resamplePCM16Poly(input []int16, inputRate, outputRate float64, phases, taps int) []int16 {
 	ratio := outputRate / inputRate
 	outputLen := int(float64(len(input)) * ratio)
 	output := make([]int16, outputLen)
 
-	// Отримуємо таблицю sinc значень
-	sincTable := getSincTable(windowSize)
+	bank := getPolyBank(inputRate, outputRate, phases, taps)
+	half := taps / 2
+
+	for i := range output {
+		pos := float64(i) / ratio
+		idx := int(pos)
+		frac := pos - float64(idx)
+
+		// Найближча фаза; зсув, що округлюється до 1.0, означає наступний семпл
+		p := int(frac*float64(phases) + 0.5)
+		if p >= phases {
+			p = 0
+			idx++
+		}
+
+		coeffs := bank.coeffs[p]
+		start := idx - half
+
+		sum := 0.0
+		for j := 0; j < taps; j++ {
+			inputIdx := start + j
+			if inputIdx < 0 || inputIdx >= len(input) {
+				continue
+			}
+			sum += float64(input[inputIdx]) * coeffs[j]
+		}
 
-	// Pre-calculate window coefficients
-	window := make([]float64, windowSize*2+1)
-	for i := range window {
-		// Blackman window
-		x := float64(i) / float64(len(window)-1)
-		window[i] = 0.42 - 0.5*math.Cos(2*math.Pi*x) + 0.08*math.Cos(4*math.Pi*x)
+		output[i] = int16(math.Round(math.Max(-32768, math.Min(32767, sum))))
 	}
 
+	return output
+}
+
+// Оновлена версія resamplePCM16 з використанням попередньо обчисленої таблиці
+func resamplePCM16WithTable(input []int16, inputRate, outputRate float64, windowSize int) []int16 {
+	ratio := outputRate / inputRate
+	outputLen := int(float64(len(input)) * ratio)
+	output := make([]int16, outputLen)
+
+	// Отримуємо ядро з кешу — коефіцієнти вікна та sinc таблиця
+	// обчислюються лише один раз для кожної комбінації параметрів
+	kernel := getResampleKernel(inputRate, outputRate, windowSize)
+	sincTable := kernel.sinc
+	window := kernel.window
+
 	for i := range output {
 		pos := float64(i) / ratio
 		idx := int(pos)
@@ -1,21 +1,96 @@
+import atexit
 import subprocess
 import tempfile
+import threading
 import os
+import numpy as np
+
+from math import gcd
+
+try:
+    import sounddevice as sd
+except ImportError:  # PortAudio bindings are optional; fall back to sox/afplay
+    sd = None
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:  # without scipy, in-process playback stays at 8 kHz
+    resample_poly = None
+
+def _build_ulaw_decode_lut():
+    """Expand all 256 u-law codes to linear int16 (G.711 decode)"""
+    lut = np.empty(256, dtype=np.int16)
+    for code in range(256):
+        u = ~code & 0xFF
+        exponent = (u >> 4) & 0x07
+        mantissa = u & 0x0F
+        magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+        lut[code] = -magnitude if u & 0x80 else magnitude
+    return lut
+
+# Built once at import; decoding N bytes is then a single vectorized gather
+ULAW_DECODE_LUT = _build_ulaw_decode_lut()
+
+# RAM-backed scratch directory when available (Linux tmpfs);
+# macOS falls back to the regular temp dir
+_SCRATCH_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+_scratch_paths = set()
+
+def scratch_path(kind, ext):
+    """
+    Return a reusable per-process scratch file path
+
+    Unlike NamedTemporaryFile, the same path is handed out on every call
+    with the same kind, so open(path, 'wb') truncates in place and repeated
+    conversions skip the inode create/unlink churn. Files are removed at
+    interpreter exit.
+    """
+    path = os.path.join(
+        _SCRATCH_DIR,
+        f'wav2ulaw_{os.getpid()}_{threading.get_ident()}_{kind}.{ext}')
+    _scratch_paths.add(path)
+    return path
+
+def _cleanup_scratch():
+    for path in _scratch_paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+atexit.register(_cleanup_scratch)
 
 def play_ulaw(ulaw_bytes, sample_rate=8000, window_size=32):
-    """Play u-law audio bytes on macOS"""
-    # Create a temporary file for u-law data
-    with tempfile.NamedTemporaryFile(suffix='.ulaw', delete=False) as temp_ulaw:
-        temp_ulaw.write(ulaw_bytes)
-        temp_ulaw_path = temp_ulaw.name
+    """Play u-law audio bytes"""
+    if sd is not None:
+        # In-process playback: decode via the LUT gather and hand the int16
+        # PCM straight to PortAudio — no subprocesses, no temp files
+        pcm = ULAW_DECODE_LUT[np.frombuffer(ulaw_bytes, dtype=np.uint8)]
+        rate = 8000
+        if sample_rate != 8000 and resample_poly is not None:
+            # Polyphase upsampling to the requested rate
+            # (8k -> 44.1k is up=441, down=80)
+            g = gcd(sample_rate, 8000)
+            pcm = resample_poly(pcm, sample_rate // g, 8000 // g,
+                                window=('kaiser', 8.0))
+            pcm = np.clip(pcm, -32768, 32767).astype(np.int16)
+            rate = sample_rate
+        sd.play(pcm, samplerate=rate, blocking=True)
+        return
+
+    _play_ulaw_subprocess(ulaw_bytes, sample_rate, window_size)
 
-    # Create a temporary file for WAV output
-    temp_wav = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-    temp_wav_path = temp_wav.name
-    temp_wav.close()
+def _play_ulaw_subprocess(ulaw_bytes, sample_rate=8000, window_size=32):
+    """Play u-law audio via ./wav2ulaw and sox/afplay (macOS fallback)"""
+    # Reusable scratch files for the u-law input and WAV output
+    temp_ulaw_path = scratch_path('play_in', 'ulaw')
+    temp_wav_path = scratch_path('play_out', 'wav')
+    with open(temp_ulaw_path, 'wb') as temp_ulaw:
+        temp_ulaw.write(ulaw_bytes)
 
     try:
         # Convert u-law to WAV using our wav2ulaw utility with new interface
+        # close_fds=False keeps CPython on its posix_spawn fast path
         subprocess.run([
             './wav2ulaw',
             '--input', temp_ulaw_path,
@@ -23,7 +98,7 @@ def play_ulaw(ulaw_bytes, sample_rate=8000, window_size=32):
             '--mode', 'ulaw2wav',
             '--sample-rate', str(sample_rate),
             '--window-size', str(window_size)
-        ], check=True)
+        ], check=True, close_fds=False)
 
         # Play the WAV file using sox (play) with explicit sample rate
         # If sox is not installed, you can install it with: brew install sox
@@ -34,15 +109,11 @@ def play_ulaw(ulaw_bytes, sample_rate=8000, window_size=32):
             '-c', '1',               # number of channels (mono)
             '-e', 'signed',          # signed PCM
             temp_wav_path
-        ], check=True)
+        ], check=True, close_fds=False)
     except FileNotFoundError:
         # If sox is not found, try using afplay
         print("Warning: sox not found. Using afplay instead. For better playback, install sox: brew install sox")
-        subprocess.run(['afplay', temp_wav_path], check=True)
-    finally:
-        # Clean up the temporary files
-        os.unlink(temp_wav_path)
-        os.unlink(temp_ulaw_path)
+        subprocess.run(['afplay', temp_wav_path], check=True, close_fds=False)
 
 # Example usage:
 if __name__ == "__main__":
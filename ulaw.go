@@ -0,0 +1,77 @@
+// Copyright (c) 2024 skypro1111@gmail.com
+// All rights reserved.
+
+package wav2ulaw
+
+import "math/bits"
+
+const (
+	ulawBias = 0x84  // standard G.711 bias
+	ulawClip = 32635 // clip before adding the bias keeps the sum in 15 bits
+)
+
+// ulawEncodeTable maps (sample+32768)>>3 to a u-law byte. Entry i covers the
+// linear samples [i<<3-32768, i<<3-32761] and is built from the interval
+// midpoint, so encoding is a single table load per sample instead of a
+// signal-dependent segment search.
+var ulawEncodeTable [8192]uint8
+
+// ulawDecodeTable expands each of the 256 u-law codes to linear int16
+var ulawDecodeTable [256]int16
+
+func init() {
+	for i := range ulawEncodeTable {
+		ulawEncodeTable[i] = linearToUlaw(int16(i<<3 - 32768 + 4))
+	}
+	for code := 0; code < 256; code++ {
+		u := ^uint8(code)
+		exponent := (u >> 4) & 0x07
+		mantissa := u & 0x0F
+		magnitude := ((int32(mantissa)<<3 + ulawBias) << exponent) - ulawBias
+		if u&0x80 != 0 {
+			magnitude = -magnitude
+		}
+		ulawDecodeTable[code] = int16(magnitude)
+	}
+}
+
+// linearToUlaw encodes one 16-bit sample, finding the segment with a
+// branchless leading-zero count instead of a compare loop
+func linearToUlaw(sample int16) uint8 {
+	sign := uint8(0)
+	mag := int32(sample)
+	if mag < 0 {
+		sign = 0x80
+		mag = -mag
+	}
+	if mag > ulawClip {
+		mag = ulawClip
+	}
+	mag += ulawBias
+
+	// Segment index = position of the highest set bit of mag>>7 (0..7)
+	exponent := uint8(7 - bits.LeadingZeros8(uint8(mag>>7)))
+	mantissa := uint8((mag >> (uint(exponent) + 3)) & 0x0F)
+
+	return ^(sign | exponent<<4 | mantissa)
+}
+
+// encodeUlawSamples converts int16 samples straight to u-law bytes using the
+// precomputed table — no intermediate little-endian byte serialization
+func encodeUlawSamples(samples []int16) []byte {
+	out := make([]byte, len(samples))
+	for i, sample := range samples {
+		out[i] = ulawEncodeTable[(int32(sample)+32768)>>3]
+	}
+	return out
+}
+
+// decodeUlawSamples expands u-law bytes straight to int16 samples via the
+// precomputed table — no intermediate PCM byte buffer
+func decodeUlawSamples(ulaw []byte) []int16 {
+	out := make([]int16, len(ulaw))
+	for i, code := range ulaw {
+		out[i] = ulawDecodeTable[code]
+	}
+	return out
+}
@@ -5,11 +5,9 @@ package wav2ulaw
 
 import (
 	"bytes"
-	"encoding/binary"
 	"fmt"
 	"github.com/go-audio/audio"
 	"github.com/go-audio/wav"
-	"github.com/zaf/g711"
 	"io"
 	"math"
 	"os"
@@ -43,6 +41,10 @@ type AudioConfig struct {
 	CompressionThreshold float64
 	// Resampling window size (larger = better quality but slower)
 	ResamplingWindowSize int
+	// Number of polyphase filter phases (0 = windowed sinc resampler)
+	PolyPhases int
+	// Filter taps per polyphase phase (0 = use ResamplingWindowSize)
+	TapsPerPhase int
 	// Anti-aliasing filter cutoff ratio (0.0 to 1.0, relative to Nyquist frequency)
 	AntiAliasingCutoffRatio float64
 	// Anti-aliasing filter type
@@ -51,6 +53,11 @@ type AudioConfig struct {
 	FilterOrder int
 	// Ripple in dB for Chebyshev filter
 	ChebyshevRipple float64
+	// Biquad precision: "float64" (default) or "int16" for Q14 fixed-point
+	Precision string
+	// Pre-designed anti-aliasing sections "b0,b1,b2,a1,a2;..." (a0 == 1).
+	// When set, the built-in filter design is skipped
+	SOS string
 }
 
 // DefaultAudioConfig returns default audio configuration
@@ -71,184 +78,82 @@ func DefaultAudioConfig() *AudioConfig {
 	}
 }
 
-// applyButterworthFilter applies a Butterworth low-pass filter
-func applyButterworthFilter(samples []int16, sampleRate, cutoffFreq float64, order int) []int16 {
-	// Normalize frequency
-	wc := 2.0 * math.Pi * cutoffFreq / sampleRate
-	
-	// Create filter
-	result := make([]int16, len(samples))
-	copy(result, samples)
-	
-	// Calculate filter coefficients
-	alpha := math.Tan(wc / 2.0)
-	cosw := math.Cos(wc)
-	
-	a0 := 1.0 + alpha
-	b0 := (1.0 - cosw) / 2.0
-	b1 := 1.0 - cosw
-	b2 := (1.0 - cosw) / 2.0
-	a1 := -2.0 * cosw
-	a2 := 1.0 - alpha
-	
-	// Normalize coefficients
-	b0 /= a0
-	b1 /= a0
-	b2 /= a0
-	a1 /= a0
-	a2 /= a0
-	
-	// Apply filter
-	x1, x2 := 0.0, 0.0
-	y1, y2 := 0.0, 0.0
-	
-	for i := range result {
-		x := float64(result[i]) / 32767.0 // Normalize to [-1, 1]
-		
-		// Direct form II
-		y := b0*x + b1*x1 + b2*x2 - a1*y1 - a2*y2
-		
-		// Update delays
-		x2, x1 = x1, x
-		y2, y1 = y1, y
-		
-		// Scale back to int16
-		result[i] = int16(math.Max(-32768, math.Min(32767, y*32767.0)))
-	}
-	
-	return result
-}
+// applyBiquadQ14 applies a biquad filter in Q14 fixed point.
+// Coefficients are scaled to Q14 (range ±2 covers a1 ≈ -2 for low cutoffs);
+// the accumulator is 64-bit and the >>14 shift returns values to Q0, so the
+// filter runs on int16 samples without any float conversion per sample.
+func applyBiquadQ14(samples []int16, b0, b1, b2, a1, a2 float64) []int16 {
+	const q = 14
+	const scale = 1 << q
 
-// applyBesselFilter applies a Bessel low-pass filter
-func applyBesselFilter(samples []int16, sampleRate, cutoffFreq float64, order int) []int16 {
-	// Normalize frequency
-	wc := 2.0 * math.Pi * cutoffFreq / sampleRate
-	
-	// Create filter
-	result := make([]int16, len(samples))
-	copy(result, samples)
-	
-	// Calculate filter coefficients (3rd order Bessel approximation)
-	alpha := math.Tan(wc / 2.0)
-	alphaSq := alpha * alpha
-	alphaCu := alphaSq * alpha
-	
-	a0 := 1.0 + 2.15*alpha + 3.15*alphaSq + 1.0*alphaCu
-	b0 := 1.0 * alphaCu
-	b1 := 3.0 * alphaCu
-	b2 := 3.0 * alphaCu
-	b3 := 1.0 * alphaCu
-	a1 := (-2.0 + 2.15*alpha - 3.15*alphaSq + 3.0*alphaCu) 
-	a2 := (1.0 - 2.15*alpha + 3.15*alphaSq - 3.0*alphaCu)
-	a3 := (-0.0 + 0.0*alpha - 0.0*alphaSq + 1.0*alphaCu)
-	
-	// Normalize coefficients
-	b0 /= a0
-	b1 /= a0
-	b2 /= a0
-	b3 /= a0
-	a1 /= a0
-	a2 /= a0
-	a3 /= a0
-	
-	// Apply filter
-	x1, x2, x3 := 0.0, 0.0, 0.0
-	y1, y2, y3 := 0.0, 0.0, 0.0
-	
-	for i := range result {
-		x := float64(result[i]) / 32767.0 // Normalize to [-1, 1]
-		
-		// Direct form II
-		y := b0*x + b1*x1 + b2*x2 + b3*x3 - a1*y1 - a2*y2 - a3*y3
-		
-		// Update delays
-		x3, x2, x1 = x2, x1, x
-		y3, y2, y1 = y2, y1, y
-		
-		// Scale back to int16
-		result[i] = int16(math.Max(-32768, math.Min(32767, y*32767.0)))
-	}
-	
-	return result
-}
+	cb0 := int64(math.Round(b0 * scale))
+	cb1 := int64(math.Round(b1 * scale))
+	cb2 := int64(math.Round(b2 * scale))
+	ca1 := int64(math.Round(a1 * scale))
+	ca2 := int64(math.Round(a2 * scale))
 
-// applyChebyshevFilter applies a Chebyshev Type I low-pass filter
-func applyChebyshevFilter(samples []int16, sampleRate, cutoffFreq, rippleDb float64, order int) []int16 {
-	// Normalize frequency
-	wc := 2.0 * math.Pi * cutoffFreq / sampleRate
-	
-	// Create filter
 	result := make([]int16, len(samples))
-	copy(result, samples)
-	
-	// Calculate filter coefficients (2nd order Chebyshev approximation)
-	epsilon := math.Sqrt(math.Pow(10, rippleDb/10) - 1)
-	v0 := math.Asinh(1/epsilon) / 2.0
-	
-	alpha := math.Tan(wc / 2.0)
-	alphaSq := alpha * alpha
-	
-	sinh := math.Sinh(v0)
-	
-	// Calculate coefficients
-	a0 := 1.0 + 2.0*alpha*sinh + alphaSq
-	b0 := alphaSq
-	b1 := 2.0 * alphaSq
-	b2 := alphaSq
-	a1 := 2.0 * (alphaSq - 1.0)
-	a2 := 1.0 - 2.0*alpha*sinh + alphaSq
-	
-	// Normalize coefficients
-	b0 /= a0
-	b1 /= a0
-	b2 /= a0
-	a1 /= a0
-	a2 /= a0
-	
-	// Apply filter
-	x1, x2 := 0.0, 0.0
-	y1, y2 := 0.0, 0.0
-	
-	for i := range result {
-		x := float64(result[i]) / 32767.0 // Normalize to [-1, 1]
-		
-		// Direct form II
-		y := b0*x + b1*x1 + b2*x2 - a1*y1 - a2*y2
-		
+	var x1, x2, y1, y2 int64
+
+	for i, sample := range samples {
+		x := int64(sample)
+
+		// Direct form I with integer MACs
+		acc := cb0*x + cb1*x1 + cb2*x2 - ca1*y1 - ca2*y2
+		y := acc >> q
+
 		// Update delays
 		x2, x1 = x1, x
 		y2, y1 = y1, y
-		
-		// Scale back to int16
-		result[i] = int16(math.Max(-32768, math.Min(32767, y*32767.0)))
+
+		if y > 32767 {
+			y = 32767
+		} else if y < -32768 {
+			y = -32768
+		}
+		result[i] = int16(y)
 	}
-	
+
 	return result
 }
 
 // applyAntiAliasingFilter applies the selected anti-aliasing filter
-func applyAntiAliasingFilter(samples []int16, sampleRate, targetRate float64, config *AudioConfig) []int16 {
+func applyAntiAliasingFilter(samples []int16, sampleRate, targetRate float64, config *AudioConfig) ([]int16, error) {
 	// Nyquist frequency of target sample rate
 	nyquistFreq := targetRate / 2.0
-	
+
 	// Use configured cutoff ratio
 	cutoffFreq := nyquistFreq * config.AntiAliasingCutoffRatio
-	
+
 	// If source sample rate is lower than target, no need for anti-aliasing
 	if sampleRate <= targetRate {
-		return samples
+		return samples, nil
+	}
+
+	// Q14 fixed-point biquads on request
+	fixedPoint := config.Precision == "int16"
+
+	// Pre-designed sections from the caller skip the filter design entirely;
+	// a malformed spec is an error rather than a silent fallback, since
+	// the caller asked for exactly these sections
+	if config.SOS != "" {
+		sections, err := parseSOS(config.SOS)
+		if err != nil {
+			return nil, fmt.Errorf("invalid SOS spec: %v", err)
+		}
+		return applyCascade(samples, sections, fixedPoint), nil
 	}
-	
-	// Apply selected filter type
+
+	// Apply selected filter type as a cascade of second-order sections
 	switch config.AntiAliasingType {
 	case AAButterworth:
-		return applyButterworthFilter(samples, sampleRate, cutoffFreq, config.FilterOrder)
+		return applyCascade(samples, designButterworthSOS(config.FilterOrder, cutoffFreq, sampleRate), fixedPoint), nil
 	case AABessel:
-		return applyBesselFilter(samples, sampleRate, cutoffFreq, config.FilterOrder)
+		return applyCascade(samples, designBesselSOS(config.FilterOrder, cutoffFreq, sampleRate), fixedPoint), nil
 	case AAChebyshev:
-		return applyChebyshevFilter(samples, sampleRate, cutoffFreq, config.ChebyshevRipple, config.FilterOrder)
+		return applyCascade(samples, designChebyshevSOS(config.FilterOrder, cutoffFreq, sampleRate, config.ChebyshevRipple), fixedPoint), nil
 	default: // AASimple
-		return applyLowPassFilter(samples, sampleRate, cutoffFreq)
+		return applyLowPassFilter(samples, sampleRate, cutoffFreq), nil
 	}
 }
 
@@ -468,11 +373,22 @@ func ConvertWavBytesToUlaw(wavBytes []byte, config *AudioConfig) ([]byte, error)
 	}
 
 	// Apply anti-aliasing filter before resampling
-	samples = applyAntiAliasingFilter(samples, float64(inputSampleRate), 8000, config)
+	samples, err = applyAntiAliasingFilter(samples, float64(inputSampleRate), 8000, config)
+	if err != nil {
+		return nil, err
+	}
 
 	// Resample to 8kHz using optimized function
 	if inputSampleRate != 8000 {
-		samples = resamplePCM16WithTable(samples, float64(inputSampleRate), 8000, config.ResamplingWindowSize)
+		if config.PolyPhases > 0 {
+			taps := config.TapsPerPhase
+			if taps == 0 {
+				taps = config.ResamplingWindowSize
+			}
+			samples = resamplePCM16Poly(samples, float64(inputSampleRate), 8000, config.PolyPhases, taps)
+		} else {
+			samples = resamplePCM16WithTable(samples, float64(inputSampleRate), 8000, config.ResamplingWindowSize)
+		}
 	}
 
 	// Apply volume processing after resampling
@@ -484,27 +400,15 @@ func ConvertWavBytesToUlaw(wavBytes []byte, config *AudioConfig) ([]byte, error)
 		samples = normalizeAudio(samples, config.NormalizePeak)
 	}
 
-	// Convert samples to bytes for g711
-	pcmBytes := make([]byte, len(samples)*2)
-	for i, sample := range samples {
-		binary.LittleEndian.PutUint16(pcmBytes[i*2:], uint16(sample))
-	}
-
-	// Convert to u-law
-	ulawData := g711.EncodeUlaw(pcmBytes)
-	return ulawData, nil
+	// Convert to u-law via the precomputed table — the samples go straight
+	// from int16 to u-law bytes without a little-endian PCM intermediate
+	return encodeUlawSamples(samples), nil
 }
 
 // ConvertUlawBytesToWav converts u-law encoded bytes back to WAV file bytes
 func ConvertUlawBytesToWav(ulawBytes []byte, sampleRate uint32, windowSize int) ([]byte, error) {
-	// Convert u-law to PCM
-	pcmData := g711.DecodeUlaw(ulawBytes)
-
-	// Convert bytes to int16 samples
-	samples := make([]int16, len(pcmData)/2)
-	for i := 0; i < len(samples); i++ {
-		samples[i] = int16(binary.LittleEndian.Uint16(pcmData[i*2:]))
-	}
+	// Convert u-law straight to int16 samples via the precomputed table
+	samples := decodeUlawSamples(ulawBytes)
 
 	// Resample if needed
 	if sampleRate != 8000 {